@@ -5,13 +5,7 @@ Provides unified interface to Moodle course content via Ports and Adapters patte
 Supports stub (fake data), file (local files), and real (Moodle API) adapters.
 """
 
-import os
-import sys
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.getcwd()
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
+from . import _bootstrap  # noqa: F401  (puts project root on sys.path)
 
 # Main exports
 from plugins.moodle_adapter_plugin.moodle_adapter_plugin import (
@@ -43,10 +37,26 @@ from plugins.moodle_adapter_plugin.exceptions import (
     MoodleUnavailableError,
 )
 
-# Adapters (for direct use if needed)
-from plugins.moodle_adapter_plugin.stub_adapter import StubMoodleAdapter
-from plugins.moodle_adapter_plugin.file_adapter import FileMoodleAdapter
-from plugins.moodle_adapter_plugin.real_adapter import RealMoodleAdapter
+# Adapters (for direct use if needed) - imported on first access so the
+# unused ones, and their dependencies, are never loaded
+_LAZY_ADAPTERS = {
+    "StubMoodleAdapter": "plugins.moodle_adapter_plugin.stub_adapter",
+    "FileMoodleAdapter": "plugins.moodle_adapter_plugin.file_adapter",
+    "RealMoodleAdapter": "plugins.moodle_adapter_plugin.real_adapter",
+}
+
+
+def __getattr__(name: str):
+    """Import concrete adapter classes on first access (PEP 562)."""
+    module_name = _LAZY_ADAPTERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    import importlib
+    
+    adapter_cls = getattr(importlib.import_module(module_name), name)
+    globals()[name] = adapter_cls
+    return adapter_cls
 
 
 __all__ = [
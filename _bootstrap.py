@@ -0,0 +1,15 @@
+"""
+Import path setup for the Moodle adapter plugin.
+
+Puts the project root (the working directory the framework runs from) on
+sys.path so absolute `plugins.*`, `utils.*`, `managers.*` and `cores.*`
+imports resolve. Imported once from __init__.py; submodules are always
+loaded through the package, so they rely on this having already run.
+"""
+
+import os
+import sys
+
+project_root = os.getcwd()
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
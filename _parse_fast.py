@@ -0,0 +1,157 @@
+"""
+Hot fixture-parsing and search loops for the stub adapter.
+
+Everything here is plain, fully annotated Python with no closures or
+dynamic attributes, so the module can be compiled as-is with mypyc
+(`mypyc plugins/moodle_adapter_plugin/_parse_fast.py`). A compiled
+extension sits next to this file and shadows it on import; remove it
+after editing the source, or it keeps running the old build.
+"""
+
+import functools
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from plugins.moodle_adapter_plugin.logging_utils import get_logger
+from plugins.moodle_adapter_plugin.models import ContentItem, Section
+from plugins.moodle_adapter_plugin.text_utils import intern_value
+
+
+# Fixed-shape ISO 8601 timestamps ("2024-09-15T23:59:00Z"), parsed directly;
+# ASCII-only, so other Unicode digits fall through to fromisoformat()
+_ISO_DATETIME_RE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(Z|[+-]\d{2}:\d{2})?",
+    re.ASCII,
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_utc_offset(value: str | None) -> timezone | None:
+    """Convert "Z" / "+HH:MM" / "-HH:MM" (or None) to a tzinfo."""
+    if value is None:
+        return None
+    if value == "Z":
+        return timezone.utc
+    sign = -1 if value[0] == "-" else 1
+    offset = timedelta(hours=int(value[1:3]), minutes=int(value[4:6]))
+    return timezone(sign * offset)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_iso_datetime(value: str) -> datetime:
+    """
+    Parse an ISO 8601 datetime string, memoised since fixtures repeat values.
+
+    The common "YYYY-MM-DDTHH:MM:SS[Z|±HH:MM]" shape is built directly;
+    anything else goes through datetime.fromisoformat().
+
+    Raises:
+        ValueError: If the value is not a valid datetime
+    """
+    match = _ISO_DATETIME_RE.fullmatch(value)
+    if match is None:
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        return datetime.fromisoformat(value)
+
+    year, month, day, hour, minute, second, offset = match.groups()
+    return datetime(
+        int(year), int(month), int(day),
+        int(hour), int(minute), int(second),
+        tzinfo=_parse_utc_offset(offset),
+    )
+
+
+def parse_datetime(value: str | None) -> datetime | None:
+    """Parse ISO 8601 datetime string, logging and dropping invalid values."""
+    if not value:
+        return None
+    try:
+        return _parse_iso_datetime(value)
+    except ValueError:
+        get_logger("StubMoodleAdapter").warning(f"Invalid datetime format: {value}")
+        return None
+
+
+def parse_content_item(data: dict[str, Any]) -> ContentItem:
+    """Parse a ContentItem from JSON data."""
+    return ContentItem(
+        id=data["id"],
+        name=data["name"],
+        item_type=intern_value(data["item_type"]),
+        url=data.get("url"),
+        content=data.get("content"),
+        file_type=intern_value(data.get("file_type")),
+        due_date=parse_datetime(data.get("due_date")),
+        metadata=data.get("metadata", {}),
+        is_visible=data.get("is_visible", True),
+        available_from=parse_datetime(data.get("available_from")),
+        available_until=parse_datetime(data.get("available_until")),
+    )
+
+
+def _parse_section_node(data: dict[str, Any]) -> Section:
+    """Parse a single Section and its items; subsections are left empty."""
+    return Section(
+        id=data["id"],
+        name=intern_value(data["name"]),
+        summary=data.get("summary", ""),
+        position=data["position"],
+        depth=data.get("depth", 0),
+        parent_id=intern_value(data.get("parent_id")),
+        items=[parse_content_item(item) for item in data.get("items", [])],
+        subsections=[],
+        is_visible=data.get("is_visible", True),
+        available_from=parse_datetime(data.get("available_from")),
+        available_until=parse_datetime(data.get("available_until")),
+    )
+
+
+def parse_section(data: dict[str, Any]) -> Section:
+    """
+    Parse a Section from JSON data, including nested subsections.
+
+    Subsections are filled in from an explicit work stack rather than by
+    recursion. Each node's children are built in order before being
+    pushed, so sibling order matches the JSON regardless of stack order.
+    """
+    root = _parse_section_node(data)
+    stack: list[tuple[dict[str, Any], Section]] = [(data, root)]
+
+    while stack:
+        section_data, section = stack.pop()
+        subsections_data: list[dict[str, Any]] = section_data.get("subsections", [])
+        if not subsections_data:
+            continue
+
+        children = [_parse_section_node(sub) for sub in subsections_data]
+        section.subsections.extend(children)
+        stack.extend(zip(subsections_data, children))
+
+    return root
+
+
+def search_flat(
+    names_lower: list[str],
+    contents_lower: list[str | None],
+    positions: list[int],
+    query_lower: str
+) -> tuple[list[int], list[int]]:
+    """
+    Substring-match query_lower against the given entry positions.
+
+    Returns:
+        (name_hits, content_hits): positions whose name contains the query,
+        and positions matched only by their content, each in the given order
+    """
+    name_hits: list[int] = []
+    content_hits: list[int] = []
+    for position in positions:
+        if query_lower in names_lower[position]:
+            name_hits.append(position)
+        else:
+            content = contents_lower[position]
+            if content is not None and query_lower in content:
+                content_hits.append(position)
+    return name_hits, content_hits
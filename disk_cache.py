@@ -0,0 +1,81 @@
+"""
+On-disk pickle cache for adapter startup data.
+
+Adapters use this to skip re-parsing course data that has not changed
+since the last run. Each cache file stores (version, signature, payload);
+a cache is only returned when both the format version and the caller's
+signature match, so stale or foreign files are ignored and rewritten.
+"""
+
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+# Bump whenever the domain models, a cached payload layout, or the way
+# adapters derive cached data (e.g. item ordering) changes
+CACHE_FORMAT_VERSION = 3
+
+
+def load_cache(cache_path: Path, signature: Any) -> Any | None:
+    """
+    Load a cached payload if it matches the expected signature.
+
+    Args:
+        cache_path: Path to the cache file
+        signature: Value describing the source data the payload was built from
+
+    Returns:
+        The cached payload, or None if missing, stale, or unreadable
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            version, cached_signature, payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+            ImportError, TypeError, ValueError):
+        return None
+
+    if version != CACHE_FORMAT_VERSION or cached_signature != signature:
+        return None
+    return payload
+
+
+def save_cache(cache_path: Path, signature: Any, payload: Any) -> None:
+    """
+    Atomically write a payload to the cache file.
+
+    Writes to a temp file in the same directory and swaps it in with
+    os.replace(), so readers never see a partially written cache.
+
+    Raises:
+        OSError: If the cache directory is not writable
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=cache_path.parent,
+        prefix=f"{cache_path.name}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(
+                (CACHE_FORMAT_VERSION, signature, payload),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def delete_cache(cache_path: Path) -> None:
+    """Remove a cache file if it exists."""
+    try:
+        os.unlink(cache_path)
+    except FileNotFoundError:
+        pass
@@ -6,14 +6,6 @@ Following ADHD exception policy:
 - All adapter exceptions inherit from ADHDError for consistent error handling
 """
 
-import os
-import sys
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.getcwd()
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
 from cores.exceptions_core.adhd_exceptions import ADHDError
 
 
@@ -5,19 +5,19 @@ Reads course data from local files for offline development.
 Supports markdown and plain text files organized by course/week.
 """
 
+import asyncio
+import functools
+import hashlib
 import os
-import sys
+import re
+import stat
+import threading
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.getcwd()
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
-from utils.logger_util import Logger
-
+from plugins.moodle_adapter_plugin.logging_utils import get_logger
 from plugins.moodle_adapter_plugin.models import (
     CourseInfo,
     ContentItem,
@@ -29,6 +29,46 @@ from plugins.moodle_adapter_plugin.exceptions import (
     CourseNotFoundError,
     ItemNotFoundError,
 )
+from plugins.moodle_adapter_plugin.disk_cache import (
+    load_cache,
+    save_cache,
+    delete_cache,
+)
+from plugins.moodle_adapter_plugin.text_io import read_text
+from plugins.moodle_adapter_plugin.text_utils import (
+    create_snippet,
+    intern_value,
+    rank_results,
+)
+
+
+# libyaml-backed loader when PyYAML was built with it, pure-Python otherwise
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Persisted scan results, stored at the top of courses_path
+_SCAN_CACHE_NAME = "_scan_cache.pkl"
+
+# File extension -> (item_type, file_type) for supported item files
+_TYPE_MAPPING: dict[str, tuple[str, str | None]] = {
+    ".pdf": ("file", "pdf"),
+    ".docx": ("file", "docx"),
+    ".pptx": ("file", "pptx"),
+    ".txt": ("page", None),
+    ".md": ("page", None),
+    ".html": ("page", None),
+}
+
+# Extensions whose file is itself the item's text content
+_TEXT_SUFFIXES = frozenset({".txt", ".md", ".html"})
+
+# Digit runs in directory/file names, for natural ordering
+_DIGITS_RE = re.compile(r"(\d+)")
+
+
+def _natural_key(name: str) -> tuple:
+    """Sort key comparing embedded numbers numerically (week9 before week10)."""
+    parts = _DIGITS_RE.split(name)
+    return tuple(int(part) if i % 2 else part for i, part in enumerate(parts)), name
 
 
 class FileMoodleAdapter:
@@ -52,22 +92,61 @@ class FileMoodleAdapter:
             └── ...
     """
     
-    def __init__(self, courses_path: str):
+    def __init__(
+        self,
+        courses_path: str,
+        scan_workers: int = 16,
+        item_cache_size: int = 256
+    ):
         """
         Initialize file adapter with path to course files.
         
         Args:
             courses_path: Path to the directory containing course folders
+            scan_workers: Max threads used to load course directories concurrently
+            item_cache_size: Max item texts kept in memory, and separately
+                max lowercased copies kept for search
         """
         self.courses_path = Path(courses_path)
-        self.logger = Logger(name="FileMoodleAdapter")
+        self._scan_cache_path = self.courses_path / _SCAN_CACHE_NAME
+        self.scan_workers = max(1, scan_workers)
+        self.logger = get_logger("FileMoodleAdapter")
+        
+        # Bounded per-instance LRUs for item text reads, their lowercased
+        # copies (search), and search snippets
+        self._read_item = functools.lru_cache(maxsize=item_cache_size)(self._read_item_sync)
+        self._read_item_lower = functools.lru_cache(maxsize=item_cache_size)(self._read_item_lower_sync)
+        self._item_snippet = functools.lru_cache(maxsize=1024)(self._build_item_snippet)
         
         # Cache for loaded data
         self._course_info_cache: dict[str, CourseInfo] = {}
         self._course_content_cache: dict[str, CourseContent] = {}
         self._item_registry: dict[str, tuple[str, Path]] = {}  # item_id -> (course_id, file_path)
         
-        self._scan_courses()
+        # Per-course flat (item, section_name, lowercased name) list for search
+        self._flat_items: dict[str, list[tuple[ContentItem, str, str]]] = {}
+        
+        # The tree scan is deferred to warmup()/first use so construction
+        # never blocks the event loop on filesystem I/O
+        self._scanned = False
+        self._scan_lock = threading.Lock()
+    
+    async def warmup(self) -> None:
+        """
+        Scan the courses tree in a worker thread, keeping the event loop free.
+        
+        Every accessor warms up on first use; call this early to overlap
+        the scan with other startup work.
+        """
+        if not self._scanned:
+            await asyncio.to_thread(self._ensure_scanned)
+    
+    def _ensure_scanned(self) -> None:
+        """Run the course scan exactly once, even if called concurrently."""
+        with self._scan_lock:
+            if not self._scanned:
+                self._scan_courses()
+                self._scanned = True
     
     def _scan_courses(self) -> None:
         """Scan course directories and build cache."""
@@ -75,88 +154,208 @@ class FileMoodleAdapter:
             self.logger.warning(f"Courses path not found: {self.courses_path}")
             return
         
-        for course_dir in self.courses_path.iterdir():
-            if not course_dir.is_dir() or course_dir.name.startswith("_"):
+        signature = self._tree_signature()
+        cached = load_cache(self._scan_cache_path, signature)
+        if cached is not None:
+            self._course_info_cache, self._course_content_cache, self._item_registry = cached
+            self.logger.debug(f"Loaded {len(self._course_info_cache)} courses from scan cache")
+        else:
+            self._load_courses()
+            
+            try:
+                save_cache(
+                    self._scan_cache_path,
+                    signature,
+                    (self._course_info_cache, self._course_content_cache, self._item_registry),
+                )
+            except OSError as e:
+                self.logger.debug(f"Could not write scan cache: {e}")
+        
+        self._flat_items = {
+            course_id: [
+                (item, section.name, item.name.lower())
+                for section in course_content.sections
+                for item in section.items
+            ]
+            for course_id, course_content in self._course_content_cache.items()
+        }
+    
+    def _load_courses(self) -> None:
+        """Load every course directory under courses_path into the caches."""
+        with os.scandir(self.courses_path) as entries:
+            course_dirs = [
+                Path(entry.path) for entry in entries
+                if entry.is_dir() and not entry.name.startswith("_")
+            ]
+        
+        if not course_dirs:
+            return
+        
+        # Course loads are I/O bound (scandir + YAML reads), so overlap them.
+        # Workers touch no shared state; results are merged here in order.
+        workers = min(self.scan_workers, len(course_dirs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._load_course_data, course_dirs))
+        
+        for result in results:
+            if result is None:
                 continue
+            course_info, course_content, registry = result
+            self._course_info_cache[course_info.id] = course_info
+            self._course_content_cache[course_info.id] = course_content
+            self._item_registry.update(registry)
+    
+    def _tree_signature(self) -> str:
+        """
+        Fingerprint the courses tree from (path, mtime, size) of every entry.
+        
+        Any added, removed, or edited file or directory changes the signature.
+        Symlinks are followed, as the scan follows them, so changes behind a
+        linked course, section, or file count too; each directory is walked
+        once, which also stops symlink loops. The root directory's own mtime
+        is excluded, since writing the scan cache itself updates it.
+        """
+        digest = hashlib.sha256(str(self.courses_path.resolve()).encode("utf-8"))
+        root_stat = os.stat(self.courses_path)
+        visited = {(root_stat.st_dev, root_stat.st_ino)}
+        pending = [self.courses_path]
+        
+        while pending:
+            directory = pending.pop()
+            with os.scandir(directory) as entries:
+                children = sorted(entries, key=lambda e: e.name)
             
-            self._load_course(course_dir)
+            for entry in children:
+                if directory == self.courses_path and entry.name.startswith(_SCAN_CACHE_NAME):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    # Dangling symlink: the scan skips it, but repairing it must count
+                    digest.update(f"{entry.path}\0dangling\n".encode("utf-8"))
+                    continue
+                digest.update(f"{entry.path}\0{st.st_mtime_ns}\0{st.st_size}\n".encode("utf-8"))
+                if stat.S_ISDIR(st.st_mode) and (st.st_dev, st.st_ino) not in visited:
+                    visited.add((st.st_dev, st.st_ino))
+                    pending.append(Path(entry.path))
+        
+        return digest.hexdigest()
+    
+    def clear_caches(self) -> None:
+        """
+        Drop cached item text and snippets, and delete the persisted scan cache.
+        
+        Course structure already loaded stays in place; the next adapter
+        instance rescans the tree.
+        """
+        self._read_item.cache_clear()
+        self._read_item_lower.cache_clear()
+        self._item_snippet.cache_clear()
+        
+        try:
+            delete_cache(self._scan_cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not delete scan cache: {e}")
     
-    def _load_course(self, course_dir: Path) -> None:
-        """Load a single course from directory."""
+    def _load_course_data(
+        self, 
+        course_dir: Path
+    ) -> tuple[CourseInfo, CourseContent, dict[str, tuple[str, Path]]] | None:
+        """
+        Load a single course from directory without touching adapter caches.
+        
+        Returns (course_info, course_content, item_registry_entries),
+        or None if the directory is not a course.
+        """
         meta_path = course_dir / "_meta.yaml"
         if not meta_path.exists():
             self.logger.warning(f"Missing _meta.yaml in {course_dir}")
-            return
+            return None
         
         with open(meta_path, "r", encoding="utf-8") as f:
-            meta = yaml.safe_load(f)
+            meta = yaml.load(f, Loader=_YamlLoader)
         
         course_info = CourseInfo(
-            id=meta.get("id", course_dir.name),
+            id=intern_value(meta.get("id", course_dir.name)),
             code=meta.get("code", course_dir.name),
             name=meta.get("name", course_dir.name),
-            instructor=meta.get("instructor", "Unknown"),
-            semester=meta.get("semester", "Unknown"),
+            instructor=intern_value(meta.get("instructor", "Unknown")),
+            semester=intern_value(meta.get("semester", "Unknown")),
         )
-        self._course_info_cache[course_info.id] = course_info
         
         # Load sections
         sections: list[Section] = []
+        registry: dict[str, tuple[str, Path]] = {}
         item_counter = 0
         
-        for section_dir in sorted(course_dir.iterdir()):
-            if not section_dir.is_dir() or section_dir.name.startswith("_"):
-                continue
-            
+        with os.scandir(course_dir) as entries:
+            section_entries = sorted(
+                (e for e in entries if e.is_dir() and not e.name.startswith("_")),
+                key=lambda e: _natural_key(e.name),
+            )
+        
+        for entry in section_entries:
             section, item_count = self._load_section(
-                section_dir, 
+                Path(entry.path), 
                 course_info.id, 
                 len(sections),
-                item_counter
+                item_counter,
+                registry,
             )
             sections.append(section)
             item_counter += item_count
         
-        self._course_content_cache[course_info.id] = CourseContent(
+        course_content = CourseContent(
             course_id=course_info.id,
             sections=sections,
         )
         
         self.logger.debug(f"Loaded course: {course_info.id} with {len(sections)} sections")
+        return course_info, course_content, registry
     
     def _load_section(
         self, 
         section_dir: Path, 
         course_id: str, 
         position: int,
-        item_start: int
+        item_start: int,
+        registry: dict[str, tuple[str, Path]]
     ) -> tuple[Section, int]:
-        """Load a section from directory. Returns (section, item_count)."""
+        """
+        Load a section from directory. Returns (section, item_count).
+        
+        Item file paths are recorded in the given registry.
+        """
         section_meta_path = section_dir / "_section.yaml"
         
         if section_meta_path.exists():
             with open(section_meta_path, "r", encoding="utf-8") as f:
-                section_meta = yaml.safe_load(f) or {}
+                section_meta = yaml.load(f, Loader=_YamlLoader) or {}
         else:
             section_meta = {}
         
-        section_id = section_meta.get("id", f"section_{section_dir.name}")
-        section_name = section_meta.get("name", section_dir.name.replace("_", " ").title())
+        section_id = intern_value(section_meta.get("id", f"section_{section_dir.name}"))
+        section_name = intern_value(section_meta.get("name", section_dir.name.replace("_", " ").title()))
         
         # Load items (files in this directory)
         items: list[ContentItem] = []
         item_counter = item_start
         
-        for file_path in sorted(section_dir.iterdir()):
-            if file_path.is_dir() or file_path.name.startswith("_"):
-                continue
-            if file_path.suffix in [".yaml", ".yml"]:
+        with os.scandir(section_dir) as entries:
+            file_entries = sorted(
+                (e for e in entries if not e.is_dir() and not e.name.startswith("_")),
+                key=lambda e: _natural_key(e.name),
+            )
+        
+        for entry in file_entries:
+            suffix = os.path.splitext(entry.name)[1]
+            if suffix in [".yaml", ".yml"]:
                 continue
             
-            item = self._file_to_content_item(file_path, item_counter)
+            item = self._file_to_content_item(entry.name, suffix.lower(), item_counter)
             if item:
                 items.append(item)
-                self._item_registry[item.id] = (course_id, file_path)
+                registry[item.id] = (course_id, Path(entry.path))
                 item_counter += 1
         
         section = Section(
@@ -175,31 +374,28 @@ class FileMoodleAdapter:
         
         return section, item_counter - item_start
     
-    def _file_to_content_item(self, file_path: Path, counter: int) -> ContentItem | None:
-        """Convert a file to a ContentItem."""
-        suffix = file_path.suffix.lower()
-        name = file_path.stem.replace("_", " ").title()
+    def _file_to_content_item(
+        self,
+        file_name: str,
+        suffix: str,
+        counter: int
+    ) -> ContentItem | None:
+        """Convert a file (by name and lowercased suffix) to a ContentItem."""
+        stem = file_name[:-len(suffix)] if suffix else file_name
+        name = stem.replace("_", " ").title()
         
         # Determine item type based on extension
-        type_mapping = {
-            ".pdf": ("file", "pdf"),
-            ".docx": ("file", "docx"),
-            ".pptx": ("file", "pptx"),
-            ".txt": ("page", None),
-            ".md": ("page", None),
-            ".html": ("page", None),
-        }
-        
-        if suffix not in type_mapping:
+        entry = _TYPE_MAPPING.get(suffix)
+        if entry is None:
             return None
         
-        item_type, file_type = type_mapping[suffix]
+        item_type, file_type = entry
         
         return ContentItem(
             id=f"file_item_{counter}",
             name=name,
-            item_type=item_type,
-            file_type=file_type,
+            item_type=intern_value(item_type),
+            file_type=intern_value(file_type),
             is_visible=True,
         )
     
@@ -219,92 +415,94 @@ class FileMoodleAdapter:
     
     async def get_course_info(self, course_id: str) -> CourseInfo:
         """Get course metadata."""
-        if course_id not in self._course_info_cache:
+        await self.warmup()
+        course_info = self._course_info_cache.get(course_id)
+        if course_info is None:
             raise CourseNotFoundError(course_id)
-        return self._course_info_cache[course_id]
+        return course_info
     
     async def get_course_content(self, course_id: str) -> CourseContent:
         """Get the full structured content of a course."""
-        if course_id not in self._course_content_cache:
+        await self.warmup()
+        course_content = self._course_content_cache.get(course_id)
+        if course_content is None:
             raise CourseNotFoundError(course_id)
-        return self._course_content_cache[course_id]
+        return course_content
     
     async def get_item_content(self, item_id: str) -> str:
         """Get the extracted text content of a content item."""
-        if item_id not in self._item_registry:
+        await self.warmup()
+        entry = self._item_registry.get(item_id)
+        if entry is None:
             raise ItemNotFoundError(item_id)
         
-        _, file_path = self._item_registry[item_id]
-        
+        _, file_path = entry
+        return self._read_item(file_path)
+    
+    def _read_item_sync(self, file_path: Path) -> str:
+        """Read an item's text from disk (wrapped by the _read_item LRU)."""
         # For text-based files, read directly
-        if file_path.suffix.lower() in [".txt", ".md", ".html"]:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
+        if file_path.suffix.lower() in _TEXT_SUFFIXES:
+            return read_text(file_path)
         
         # For other files, look for companion .txt file
         txt_path = file_path.with_suffix(".txt")
         if txt_path.exists():
-            with open(txt_path, "r", encoding="utf-8") as f:
-                return f.read()
+            return read_text(txt_path)
         
         # No content available
         return ""
     
-    async def search(self, query: str, course_id: str) -> list[SearchResult]:
+    def _read_item_lower_sync(self, file_path: Path) -> str:
+        """
+        Read an item's lowercased text for search (wrapped by the _read_item_lower LRU).
+        
+        Reads past the _read_item LRU, so scanning a large course does not
+        evict the texts get_item_content() callers are working with.
+        """
+        return self._read_item_sync(file_path).lower()
+    
+    async def search(
+        self,
+        query: str,
+        course_id: str,
+        limit: int | None = None
+    ) -> list[SearchResult]:
         """Search within a specific course's materials."""
-        if course_id not in self._course_content_cache:
+        await self.warmup()
+        flat_items = self._flat_items.get(course_id)
+        if flat_items is None:
             raise CourseNotFoundError(course_id)
         
         results: list[SearchResult] = []
-        course_content = self._course_content_cache[course_id]
         query_lower = query.lower()
         
-        for section in course_content.sections:
-            for item in section.items:
-                # Search in item name
-                if query_lower in item.name.lower():
-                    results.append(SearchResult(
-                        item=item,
-                        section_name=section.name,
-                        snippet=item.name,
-                        relevance_score=0.8,
-                    ))
-                    continue
-                
-                # Search in item content
-                if item.id in self._item_registry:
-                    try:
-                        content = await self.get_item_content(item.id)
-                        if query_lower in content.lower():
-                            snippet = self._create_snippet(content, query)
-                            results.append(SearchResult(
-                                item=item,
-                                section_name=section.name,
-                                snippet=snippet,
-                                relevance_score=0.6,
-                            ))
-                    except ItemNotFoundError:
-                        pass
-        
-        results.sort(key=lambda r: r.relevance_score, reverse=True)
-        return results
-    
-    def _create_snippet(self, text: str, query: str, context_chars: int = 50) -> str:
-        """Create a snippet with the query in context."""
-        query_lower = query.lower()
-        text_lower = text.lower()
-        
-        idx = text_lower.find(query_lower)
-        if idx == -1:
-            return text[:100] + "..." if len(text) > 100 else text
-        
-        start = max(0, idx - context_chars)
-        end = min(len(text), idx + len(query) + context_chars)
-        
-        snippet = text[start:end]
-        if start > 0:
-            snippet = "..." + snippet
-        if end < len(text):
-            snippet = snippet + "..."
+        for item, section_name, name_lower in flat_items:
+            # Search in item name
+            if query_lower in name_lower:
+                results.append(SearchResult(
+                    item=item,
+                    section_name=section_name,
+                    snippet=item.name,
+                    relevance_score=0.8,
+                ))
+                continue
+            
+            # Search in item content
+            entry = self._item_registry.get(item.id)
+            if entry is not None and query_lower in self._read_item_lower(entry[1]):
+                results.append(SearchResult(
+                    item=item,
+                    section_name=section_name,
+                    snippet=self._item_snippet(item.id, query_lower),
+                    relevance_score=0.6,
+                ))
         
-        return snippet
+        return rank_results(results, limit)
+    
+    def _build_item_snippet(self, item_id: str, query_lower: str) -> str:
+        """Build the snippet for a content hit (wrapped by the _item_snippet LRU)."""
+        _, file_path = self._item_registry[item_id]
+        return create_snippet(
+            self._read_item(file_path), self._read_item_lower(file_path), query_lower
+        )
@@ -0,0 +1,18 @@
+"""
+Shared Logger instances for the Moodle adapter plugin.
+
+Adapters and the factory ask for loggers by name here instead of
+constructing Logger directly, so repeated adapter construction (or
+get_adapter() calls) reuse one instance per name and never repeat
+handler setup.
+"""
+
+from functools import cache
+
+from utils.logger_util import Logger
+
+
+@cache
+def get_logger(name: str) -> Logger:
+    """Return the shared Logger for name, creating it on first use."""
+    return Logger(name=name)
@@ -8,16 +8,10 @@ Design Philosophy:
 - Sections are opaque containers (no semantic interpretation)
 - ContentItem unifies activities and resources
 - Visibility fields future-proof for unknown Moodle API behavior
+- Models use __slots__ and are frozen unless adapters build them in place
+  (Section), keeping large courses compact in memory
 """
 
-import os
-import sys
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.getcwd()
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Literal
@@ -36,7 +30,7 @@ ItemType = Literal[
 ]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CourseInfo:
     """
     Basic course information.
@@ -50,7 +44,7 @@ class CourseInfo:
     semester: str          # e.g., "2024-25 Sem 1"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContentItem:
     """
     A unified content item (activity OR resource).
@@ -79,7 +73,7 @@ class ContentItem:
     available_until: datetime | None = None      # Item not available after this datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Section:
     """
     A section within a course (opaque container).
@@ -104,7 +98,7 @@ class Section:
     available_until: datetime | None = None      # Section not available after this datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CourseContent:
     """
     Full structured content of a course.
@@ -115,7 +109,7 @@ class CourseContent:
     sections: list[Section]   # Top-level sections only (subsections are nested)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchResult:
     """
     A search result from course content.
@@ -11,27 +11,23 @@ Usage:
     course_info = await adapter.get_course_info("COMP1001-2024")
 """
 
-import os
-import sys
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.getcwd()
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
 from managers.config_manager import ConfigManager
-from utils.logger_util import Logger
 
-from plugins.moodle_adapter_plugin.stub_adapter import StubMoodleAdapter
-from plugins.moodle_adapter_plugin.file_adapter import FileMoodleAdapter
-from plugins.moodle_adapter_plugin.real_adapter import RealMoodleAdapter
+from plugins.moodle_adapter_plugin.logging_utils import get_logger
 from plugins.moodle_adapter_plugin.moodle_port import IMoodlePort
 
+# Concrete adapters are imported lazily in get_adapter() so only the
+# selected one (and its dependencies, e.g. PyYAML) is loaded
+if TYPE_CHECKING:
+    from plugins.moodle_adapter_plugin.stub_adapter import StubMoodleAdapter
+    from plugins.moodle_adapter_plugin.file_adapter import FileMoodleAdapter
+    from plugins.moodle_adapter_plugin.real_adapter import RealMoodleAdapter
+
 
 # Type alias for any adapter implementation
-MoodleAdapter = Union[StubMoodleAdapter, FileMoodleAdapter, RealMoodleAdapter]
+MoodleAdapter = Union["StubMoodleAdapter", "FileMoodleAdapter", "RealMoodleAdapter"]
 
 # Singleton adapter instance
 _adapter_instance: MoodleAdapter | None = None
@@ -56,7 +52,7 @@ def get_adapter(force_mode: str | None = None) -> MoodleAdapter:
     """
     global _adapter_instance
     
-    logger = Logger(name="MoodleAdapterPlugin")
+    logger = get_logger("MoodleAdapterPlugin")
     
     # Return cached instance if available and no force override
     if _adapter_instance is not None and force_mode is None:
@@ -72,18 +68,31 @@ def get_adapter(force_mode: str | None = None) -> MoodleAdapter:
     
     # Create appropriate adapter
     if mode == "stub":
+        from plugins.moodle_adapter_plugin.stub_adapter import StubMoodleAdapter
+        
         stub_config = config.dict_get("stub") or {}
         scenario = stub_config.get("scenario", "demo_course")
-        _adapter_instance = StubMoodleAdapter(scenario=scenario)
+        _adapter_instance = StubMoodleAdapter(
+            scenario=scenario,
+            preload=stub_config.get("preload", True),
+        )
         logger.info(f"Using StubMoodleAdapter with scenario: {scenario}")
         
     elif mode == "file":
+        from plugins.moodle_adapter_plugin.file_adapter import FileMoodleAdapter
+        
         file_config = config.dict_get("file") or {}
         courses_path = file_config.get("courses_path", "project/data/courses")
-        _adapter_instance = FileMoodleAdapter(courses_path=courses_path)
+        _adapter_instance = FileMoodleAdapter(
+            courses_path=courses_path,
+            scan_workers=file_config.get("scan_workers", 16),
+            item_cache_size=file_config.get("item_cache_size", 256),
+        )
         logger.info(f"Using FileMoodleAdapter with path: {courses_path}")
         
     elif mode == "real":
+        from plugins.moodle_adapter_plugin.real_adapter import RealMoodleAdapter
+        
         real_config = config.dict_get("real") or {}
         _adapter_instance = RealMoodleAdapter(
             api_base_url=real_config.get("api_base_url", ""),
@@ -106,9 +115,14 @@ def reset_adapter() -> None:
     """
     Reset the adapter singleton.
     
-    Useful for testing or when config changes.
+    Useful for testing or when config changes. Also calls the current
+    adapter's clear_caches(), if it has one, to drop its in-memory and
+    persisted caches (e.g. the file adapter's item LRU and scan cache).
     """
     global _adapter_instance
+    clear_caches = getattr(_adapter_instance, "clear_caches", None)
+    if clear_caches is not None:
+        clear_caches()
     _adapter_instance = None
 
 
@@ -117,19 +131,7 @@ def verify_protocol(adapter: MoodleAdapter) -> bool:
     """
     Verify an adapter implements IMoodlePort protocol.
     
-    Used for testing and validation.
+    Used for testing and validation. The check runs against the instance,
+    so mocks and __getattr__-based wrappers around an adapter pass too.
     """
-    required_methods = [
-        "get_course_info",
-        "get_course_content", 
-        "get_item_content",
-        "search",
-    ]
-    
-    for method in required_methods:
-        if not hasattr(adapter, method):
-            return False
-        if not callable(getattr(adapter, method)):
-            return False
-    
-    return True
+    return isinstance(adapter, IMoodlePort)
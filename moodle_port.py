@@ -10,15 +10,7 @@ Design Decisions:
 - Interface represents OUR requirements, not Moodle's capabilities
 """
 
-import os
-import sys
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.getcwd()
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
-from typing import Protocol
+from typing import Protocol, runtime_checkable
 
 from plugins.moodle_adapter_plugin.models import (
     CourseInfo,
@@ -27,6 +19,7 @@ from plugins.moodle_adapter_plugin.models import (
 )
 
 
+@runtime_checkable
 class IMoodlePort(Protocol):
     """
     Abstract interface for Moodle content access.
@@ -93,7 +86,8 @@ class IMoodlePort(Protocol):
     async def search(
         self, 
         query: str, 
-        course_id: str  # REQUIRED - not optional
+        course_id: str,  # REQUIRED - not optional
+        limit: int | None = None
     ) -> list[SearchResult]:
         """
         Search within a specific course's materials.
@@ -101,6 +95,7 @@ class IMoodlePort(Protocol):
         Args:
             query: Search query string
             course_id: The course to search within (REQUIRED)
+            limit: Max number of results to return (None = all)
             
         Returns:
             Ranked search results with snippets
@@ -5,16 +5,7 @@ This adapter will connect to the actual Moodle API when available.
 Currently a placeholder that raises NotImplementedError.
 """
 
-import os
-import sys
-
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.getcwd()
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
-from utils.logger_util import Logger
-
+from plugins.moodle_adapter_plugin.logging_utils import get_logger
 from plugins.moodle_adapter_plugin.models import (
     CourseInfo,
     CourseContent,
@@ -58,7 +49,7 @@ class RealMoodleAdapter:
         self.api_token = api_token
         self.timeout = timeout
         self.cache_ttl = cache_ttl
-        self.logger = Logger(name="RealMoodleAdapter")
+        self.logger = get_logger("RealMoodleAdapter")
         
         if not api_base_url or not api_token:
             self.logger.warning("Real Moodle adapter initialized without credentials")
@@ -84,7 +75,12 @@ class RealMoodleAdapter:
             "Use 'stub' or 'file' adapter_mode in config."
         )
     
-    async def search(self, query: str, course_id: str) -> list[SearchResult]:
+    async def search(
+        self,
+        query: str,
+        course_id: str,
+        limit: int | None = None
+    ) -> list[SearchResult]:
         """Search course content via Moodle API."""
         raise MoodleUnavailableError(
             "Real Moodle adapter is not yet implemented. "
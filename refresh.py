@@ -5,14 +5,9 @@ Re-runnable setup logic. Called by `adhd_framework.py refresh`.
 """
 
 import os
-import sys
+from pathlib import Path
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.getcwd()
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
-from utils.logger_util import Logger
 
 
 def refresh() -> None:
@@ -20,17 +15,28 @@ def refresh() -> None:
     Refresh the moodle_adapter_plugin module.
     
     Called during framework refresh to ensure module is properly configured.
-    This plugin doesn't require special refresh logic beyond verification.
+    Rebuilds each stub scenario's bundle.json so the stub adapter can load
+    a scenario with a single read.
     """
-    logger = Logger(name="MoodleAdapterRefresh")
+    # Imported here so loading this module never touches sys.path; see __main__
+    from plugins.moodle_adapter_plugin.logging_utils import get_logger
+    from plugins.moodle_adapter_plugin.stub_adapter import build_fixture_bundle
+    
+    logger = get_logger("MoodleAdapterRefresh")
     logger.info("Refreshing moodle_adapter_plugin...")
     
     # Verify data directories exist
     data_path = os.path.join(current_dir, "data", "stubs")
     if os.path.exists(data_path):
-        scenarios = [d for d in os.listdir(data_path) 
-                     if os.path.isdir(os.path.join(data_path, d))]
+        with os.scandir(data_path) as entries:
+            scenarios = [e.name for e in entries if e.is_dir()]
         logger.debug(f"Found stub scenarios: {scenarios}")
+        
+        for scenario in scenarios:
+            try:
+                build_fixture_bundle(Path(data_path) / scenario)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not build fixture bundle for {scenario}: {e}")
     else:
         logger.warning(f"Stub data directory not found: {data_path}")
     
@@ -38,4 +44,12 @@ def refresh() -> None:
 
 
 if __name__ == "__main__":
+    # Run directly (python refresh.py from the project root): make the
+    # project root importable before refresh() pulls in the plugin
+    import sys
+    
+    project_root = os.getcwd()
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    
     refresh()
@@ -5,19 +5,18 @@ Loads fake course data from JSON fixtures for development and testing.
 This allows development to proceed without access to the real Moodle API.
 """
 
-import os
-import sys
+import asyncio
+import bisect
+import functools
 import json
-from datetime import datetime
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.getcwd()
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
-from utils.logger_util import Logger
-
+from plugins.moodle_adapter_plugin.logging_utils import get_logger
 from plugins.moodle_adapter_plugin.models import (
     CourseInfo,
     ContentItem,
@@ -29,6 +28,163 @@ from plugins.moodle_adapter_plugin.exceptions import (
     CourseNotFoundError,
     ItemNotFoundError,
 )
+from plugins.moodle_adapter_plugin.disk_cache import load_cache, save_cache
+from plugins.moodle_adapter_plugin.text_io import read_text
+from plugins.moodle_adapter_plugin.text_utils import create_snippet, rank_results
+from plugins.moodle_adapter_plugin._parse_fast import parse_section, search_flat
+
+# Optional fast JSON parsers, tried in order: simdjson, orjson, stdlib json
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional Aho-Corasick matcher for search_many(); falls back to search()
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# Root of the bundled stub scenarios (data/stubs/<scenario>/)
+_STUBS_PATH = Path(__file__).resolve().parent / "data" / "stubs"
+
+# Parsed fixtures cached per scenario, next to the JSON files
+_FIXTURE_CACHE_NAME = ".cache.pkl"
+
+# Single-file copy of a scenario's fixtures, written by refresh
+_FIXTURE_BUNDLE_NAME = "bundle.json"
+
+# Max threads used to read item_contents/*.txt during the bulk load
+_ITEM_READ_WORKERS = 16
+
+# Item texts kept by get_item_content() until search loads them all
+_ITEM_CACHE_SIZE = 128
+
+
+@dataclass(slots=True)
+class _SearchColumns:
+    """
+    One course's search entries as parallel columns, in traversal order.
+    
+    Search only touches the lowercased name/content columns until a
+    position matches; items and section names are looked up for hits only.
+    """
+    items: list[ContentItem] = field(default_factory=list)
+    section_names: list[str] = field(default_factory=list)
+    names_lower: list[str] = field(default_factory=list)
+    contents_lower: list[str | None] = field(default_factory=list)
+
+
+def _lower_shared(text: str) -> str:
+    """
+    text.lower(), but returns text itself when lowering changes nothing.
+    
+    Transcripts are often already lowercase; sharing the object keeps the
+    search index from holding a second full copy of their text.
+    """
+    lowered = text.lower()
+    return text if lowered == text else lowered
+
+
+def _file_signature(*paths: Path) -> tuple:
+    """(name, mtime_ns, size) per file, with None values for missing files."""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            signature.append((path.name, None, None))
+        else:
+            signature.append((path.name, st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def _load_json(path: Path):
+    """Parse a JSON fixture file, using simdjson or orjson when available."""
+    raw = path.read_bytes()
+    if simdjson is not None:
+        return simdjson.loads(raw)
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _item_files(item_contents_path: Path) -> list[tuple[str, str]]:
+    """(item_id, path) for every item_contents/*.txt file, via one scandir."""
+    try:
+        with os.scandir(item_contents_path) as entries:
+            return [
+                (entry.name[:-4], entry.path) for entry in entries
+                if entry.name.endswith(".txt") and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return []
+
+
+def _fixture_signature(data_path: Path) -> list:
+    """
+    _file_signature() of every fixture a bundle is built from, as JSON lists.
+    
+    Item files are sorted so the result does not depend on directory order;
+    an added, removed, or edited fixture file changes it.
+    """
+    item_paths = sorted(path for _, path in _item_files(data_path / "item_contents"))
+    signature = _file_signature(
+        data_path / "course_info.json",
+        data_path / "course_content.json",
+        *(Path(path) for path in item_paths),
+    )
+    return [list(entry) for entry in signature]
+
+
+def build_fixture_bundle(data_path: Path) -> Path:
+    """
+    Pack a scenario's fixtures into one bundle.json next to them.
+    
+    The bundle holds {"course_info", "course_content", "item_contents"},
+    so a cold adapter reads one file instead of 2 + N, plus the signature
+    of the files it was built from. Written atomically; the adapter
+    ignores it once any fixture file is added, removed, or changed.
+    
+    Args:
+        data_path: Scenario folder (data/stubs/<scenario>/)
+    
+    Returns:
+        Path of the written bundle
+    
+    Raises:
+        OSError: If a fixture cannot be read or the bundle cannot be written
+    """
+    # Taken before reading, so an edit made mid-build leaves the bundle stale
+    bundle: dict = {"signature": _fixture_signature(data_path)}
+    for key in ("course_info", "course_content"):
+        path = data_path / f"{key}.json"
+        if path.exists():
+            bundle[key] = _load_json(path)
+    bundle["item_contents"] = {
+        item_id: read_text(path)
+        for item_id, path in _item_files(data_path / "item_contents")
+    }
+    
+    bundle_path = data_path / _FIXTURE_BUNDLE_NAME
+    fd, tmp_path = tempfile.mkstemp(dir=data_path, prefix=f"{_FIXTURE_BUNDLE_NAME}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(bundle, f, ensure_ascii=False)
+        os.replace(tmp_path, bundle_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return bundle_path
 
 
 class StubMoodleAdapter:
@@ -39,116 +195,278 @@ class StubMoodleAdapter:
     Useful for development and testing without real Moodle access.
     """
     
-    def __init__(self, scenario: str = "demo_course"):
+    def __init__(self, scenario: str = "demo_course", preload: bool = True):
         """
         Initialize stub adapter with a specific scenario.
         
         Args:
             scenario: Name of the stub scenario folder (e.g., "demo_course")
+            preload: Load fixtures and build search indexes in a background
+                thread right away, instead of on first use
         """
         self.scenario = scenario
-        self.logger = Logger(name="StubMoodleAdapter")
-        self._data_path = Path(current_dir) / "data" / "stubs" / scenario
+        self.logger = get_logger("StubMoodleAdapter")
+        self._data_path = _STUBS_PATH / scenario
         
         if not self._data_path.exists():
             self.logger.warning(f"Stub scenario not found: {scenario}, using demo_course")
-            self._data_path = Path(current_dir) / "data" / "stubs" / "demo_course"
+            self._data_path = _STUBS_PATH / "demo_course"
         
-        # Cache for loaded data
+        # Cache for loaded data (each part is loaded on first use)
         self._course_info_cache: dict[str, CourseInfo] = {}
         self._course_content_cache: dict[str, CourseContent] = {}
-        self._item_contents: dict[str, str] = {}
+        self._item_contents: dict[str, str] = {}  # every item, once search needs them
+        
+        # Single-item reads before a bulk load: item files listed on first use,
+        # texts kept in a bounded LRU so get_item_content() holds only its working set
+        self._item_paths: dict[str, str] | None = None
+        self._read_item = functools.lru_cache(maxsize=_ITEM_CACHE_SIZE)(self._read_item_sync)
+        
+        # Per-course search index: flat entry columns in traversal order
+        self._search_entries: dict[str, _SearchColumns] = {}
+        
+        # Per-course lowercased corpus for search_many(): every entry's name and
+        # content joined by NUL, plus the start offset of each segment
+        self._search_corpus: dict[str, tuple[str, list[int]]] = {}
+        
+        # Fully ranked results per (course_id, query_lower). Stub data never
+        # changes once loaded, so repeated queries skip matching and snippets
+        self._ranked_results = functools.lru_cache(maxsize=64)(self._rank_query)
         
-        self._load_stub_data()
+        self._course_info_loaded = False
+        self._course_content_loaded = False
+        self._all_items_loaded = False
+        
+        # Parts of bundle.json not yet consumed (None until first checked)
+        self._bundle: dict | None = None
+        
+        # Held while a part loads or an index builds, by the preload thread
+        # and by accessors alike; loaded parts are read without it
+        self._load_lock = threading.Lock()
+        
+        # Set once the background preload is done (immediately if disabled).
+        # Only search waits on it, to get the prebuilt indexes; the other
+        # accessors load just what they need alongside the preload thread
+        self._preloaded = threading.Event()
+        if preload:
+            threading.Thread(
+                target=self._preload, name=f"StubPreload-{scenario}", daemon=True
+            ).start()
+        else:
+            self._preloaded.set()
     
-    def _load_stub_data(self) -> None:
-        """Load all stub data from JSON files."""
-        self.logger.debug(f"Loading stub data from: {self._data_path}")
+    def _preload(self) -> None:
+        """Load all fixtures and build every search index (runs on a thread)."""
+        try:
+            self._ensure_course_info()
+            self._ensure_course_content()
+            for course_id in list(self._course_content_cache):
+                self._ensure_search_index(course_id)
+        except Exception as e:
+            # The lazy loaders only mark a part loaded once it succeeds, so
+            # accessors retry the failed part and raise its real error
+            self.logger.warning(f"Stub preload failed ({type(e).__name__}): {e}")
+        finally:
+            self._preloaded.set()
+    
+    async def warmup(self) -> None:
+        """Wait for the background preload without blocking the event loop."""
+        if not self._preloaded.is_set():
+            await asyncio.to_thread(self._preloaded.wait)
+    
+    def _bundle_part(self, key: str):
+        """
+        Take one part of the scenario's bundle, or None to read files instead.
         
-        # Load course info
+        The bundle is read once on first use and kept only if the signature
+        it stores still matches the fixture files (so a missing or edited
+        file makes it stale); each part is handed out once so its raw data
+        can be freed.
+        """
+        if self._bundle is None:
+            self._bundle = {}
+            bundle_path = self._data_path / _FIXTURE_BUNDLE_NAME
+            if bundle_path.exists():
+                try:
+                    bundle = _load_json(bundle_path)
+                except (OSError, ValueError) as e:
+                    self.logger.warning(f"Ignoring unreadable fixture bundle: {e}")
+                else:
+                    if bundle.get("signature") == _fixture_signature(self._data_path):
+                        self._bundle = bundle
+                        self.logger.debug(f"Loaded fixture bundle for {self._data_path.name}")
+                    else:
+                        self.logger.debug(f"Ignoring stale fixture bundle for {self._data_path.name}")
+        return self._bundle.pop(key, None)
+    
+    def _ensure_course_info(self) -> None:
+        """Load course_info.json once, on first use (retried next call if it raises)."""
+        if self._course_info_loaded:
+            return
+        with self._load_lock:
+            if not self._course_info_loaded:
+                self._load_course_info()
+                self._course_info_loaded = True
+    
+    def _load_course_info(self) -> None:
+        """Parse course_info.json, or its bundle part, into the cache."""
+        data = self._bundle_part("course_info")
         course_info_path = self._data_path / "course_info.json"
-        if course_info_path.exists():
-            with open(course_info_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                course_info = CourseInfo(
-                    id=data["id"],
-                    code=data["code"],
-                    name=data["name"],
-                    instructor=data["instructor"],
-                    semester=data["semester"],
-                )
-                self._course_info_cache[course_info.id] = course_info
-                self.logger.debug(f"Loaded course info: {course_info.id}")
-        
-        # Load course content
+        if data is None and course_info_path.exists():
+            data = _load_json(course_info_path)
+        if data is not None:
+            course_info = CourseInfo(
+                id=data["id"],
+                code=data["code"],
+                name=data["name"],
+                instructor=data["instructor"],
+                semester=data["semester"],
+            )
+            self._course_info_cache[course_info.id] = course_info
+            self.logger.debug(f"Loaded course info: {course_info.id}")
+    
+    def _ensure_course_content(self) -> None:
+        """
+        Load course_content.json once, on first use.
+        
+        Only marked loaded once parsing succeeds, so a broken fixture raises
+        its real error on every call instead of looking like a missing course.
+        """
+        if self._course_content_loaded:
+            return
+        with self._load_lock:
+            if not self._course_content_loaded:
+                self._load_course_content()
+                self._course_content_loaded = True
+    
+    def _load_course_content(self) -> None:
+        """Parse course_content.json into the cache, via the parsed-fixture cache."""
         course_content_path = self._data_path / "course_content.json"
-        if course_content_path.exists():
-            with open(course_content_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                course_content = self._parse_course_content(data)
-                self._course_content_cache[course_content.course_id] = course_content
-                self.logger.debug(f"Loaded course content: {course_content.course_id}")
-        
-        # Load item contents
-        item_contents_path = self._data_path / "item_contents"
-        if item_contents_path.exists():
-            for txt_file in item_contents_path.glob("*.txt"):
-                item_id = txt_file.stem
-                with open(txt_file, "r", encoding="utf-8") as f:
-                    self._item_contents[item_id] = f.read()
-            self.logger.debug(f"Loaded {len(self._item_contents)} item contents")
+        
+        # Reuse the parsed tree while the JSON file is unchanged
+        cache_path = self._data_path / _FIXTURE_CACHE_NAME
+        signature = _file_signature(course_content_path)
+        cached = load_cache(cache_path, signature)
+        if cached is not None:
+            self._course_content_cache = cached
+            if self._bundle:
+                self._bundle.pop("course_content", None)
+            self.logger.debug(f"Loaded parsed course content from cache: {cache_path}")
+            return
+        
+        data = self._bundle_part("course_content")
+        if data is None and course_content_path.exists():
+            data = _load_json(course_content_path)
+        if data is not None:
+            course_content = self._parse_course_content(data)
+            self._course_content_cache[course_content.course_id] = course_content
+            self.logger.debug(f"Loaded course content: {course_content.course_id}")
+        
+        try:
+            save_cache(cache_path, signature, self._course_content_cache)
+        except OSError as e:
+            self.logger.debug(f"Could not write fixture cache: {e}")
+    
+    def _ensure_item(self, item_id: str) -> str | None:
+        """Get a single item's text. Returns None if it has none."""
+        # A current bundle already holds every item, so take them all at once.
+        # Never wait for the lock: if the preload holds it (e.g. for its bulk
+        # item load), a single-file read is quicker
+        if not self._all_items_loaded and self._load_lock.acquire(blocking=False):
+            try:
+                if not self._all_items_loaded:
+                    self._load_bundled_items()
+            finally:
+                self._load_lock.release()
+        
+        if self._all_items_loaded:
+            return self._item_contents.get(item_id)
+        return self._read_item(item_id)
     
-    def _parse_datetime(self, value: str | None) -> datetime | None:
-        """Parse ISO 8601 datetime string."""
-        if not value:
+    def _read_item_sync(self, item_id: str) -> str | None:
+        """Read one item's text from disk (wrapped by the _read_item LRU)."""
+        # Only ids listed in item_contents/ resolve, so none can escape it
+        path = self._get_item_paths().get(item_id)
+        if path is None:
             return None
         try:
-            # Handle both with and without timezone
-            if value.endswith("Z"):
-                value = value[:-1] + "+00:00"
-            return datetime.fromisoformat(value)
-        except ValueError:
-            self.logger.warning(f"Invalid datetime format: {value}")
+            return read_text(path)
+        except FileNotFoundError:
             return None
     
-    def _parse_content_item(self, data: dict) -> ContentItem:
-        """Parse a ContentItem from JSON data."""
-        return ContentItem(
-            id=data["id"],
-            name=data["name"],
-            item_type=data["item_type"],
-            url=data.get("url"),
-            content=data.get("content"),
-            file_type=data.get("file_type"),
-            due_date=self._parse_datetime(data.get("due_date")),
-            metadata=data.get("metadata", {}),
-            is_visible=data.get("is_visible", True),
-            available_from=self._parse_datetime(data.get("available_from")),
-            available_until=self._parse_datetime(data.get("available_until")),
-        )
+    def _get_item_paths(self) -> dict[str, str]:
+        """item_id -> path for every item_contents/*.txt file, listed once."""
+        if self._item_paths is None:
+            self._item_paths = dict(_item_files(self._data_path / "item_contents"))
+        return self._item_paths
     
-    def _parse_section(self, data: dict) -> Section:
-        """Parse a Section from JSON data (recursively handles subsections)."""
-        items = [self._parse_content_item(item) for item in data.get("items", [])]
-        subsections = [self._parse_section(sub) for sub in data.get("subsections", [])]
-        
-        return Section(
-            id=data["id"],
-            name=data["name"],
-            summary=data.get("summary", ""),
-            position=data["position"],
-            depth=data.get("depth", 0),
-            parent_id=data.get("parent_id"),
-            items=items,
-            subsections=subsections,
-            is_visible=data.get("is_visible", True),
-            available_from=self._parse_datetime(data.get("available_from")),
-            available_until=self._parse_datetime(data.get("available_until")),
-        )
+    def _ensure_all_items(self) -> None:
+        """Load every item's text once (search needs all of them)."""
+        if self._all_items_loaded or self._load_bundled_items():
+            return
+        
+        pending = list(self._get_item_paths().items())
+        if pending:
+            # Small-file reads are syscall bound and release the GIL, so
+            # overlap them; results come back in submission order
+            workers = min(_ITEM_READ_WORKERS, len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                contents = executor.map(read_text, [path for _, path in pending])
+                for (item_id, _), content in zip(pending, contents):
+                    self._item_contents[item_id] = content
+            self.logger.debug(f"Loaded {len(self._item_contents)} item contents")
+        
+        self._all_items_loaded = True
+        self._read_item.cache_clear()
+    
+    def _load_bundled_items(self) -> bool:
+        """Fill item contents from the bundle if it has them; True if it did."""
+        items = self._bundle_part("item_contents")
+        if items is None:
+            return False
+        self._item_contents.update(items)
+        self._all_items_loaded = True
+        self._read_item.cache_clear()
+        self.logger.debug(f"Loaded {len(self._item_contents)} item contents from bundle")
+        return True
+    
+    def _ensure_search_index(self, course_id: str) -> None:
+        """Build the course's search entries once, on first search."""
+        if course_id in self._search_entries:
+            return
+        with self._load_lock:
+            if course_id not in self._search_entries:
+                self._build_search_index(course_id)
+    
+    def _build_search_index(self, course_id: str) -> None:
+        """Index every item of the course, loading all item texts first."""
+        self._ensure_all_items()
+        
+        columns = _SearchColumns()
+        
+        def index_section(section: Section) -> None:
+            """Recursively index items in a section."""
+            for item in section.items:
+                name_lower = _lower_shared(item.name)
+                content = self._item_contents.get(item.id)
+                content_lower = _lower_shared(content) if content is not None else None
+                
+                columns.items.append(item)
+                columns.section_names.append(section.name)
+                columns.names_lower.append(name_lower)
+                columns.contents_lower.append(content_lower)
+            
+            for subsection in section.subsections:
+                index_section(subsection)
+        
+        for section in self._course_content_cache[course_id].sections:
+            index_section(section)
+        
+        self._search_entries[course_id] = columns
     
     def _parse_course_content(self, data: dict) -> CourseContent:
         """Parse CourseContent from JSON data."""
-        sections = [self._parse_section(sec) for sec in data.get("sections", [])]
+        sections = [parse_section(sec) for sec in data.get("sections", [])]
         return CourseContent(
             course_id=data["course_id"],
             sections=sections,
@@ -156,87 +474,161 @@ class StubMoodleAdapter:
     
     async def get_course_info(self, course_id: str) -> CourseInfo:
         """Get course metadata."""
+        self._ensure_course_info()
         if course_id not in self._course_info_cache:
             raise CourseNotFoundError(course_id)
         return self._course_info_cache[course_id]
     
     async def get_course_content(self, course_id: str) -> CourseContent:
         """Get the full structured content of a course."""
+        self._ensure_course_content()
         if course_id not in self._course_content_cache:
             raise CourseNotFoundError(course_id)
         return self._course_content_cache[course_id]
     
     async def get_item_content(self, item_id: str) -> str:
         """Get the extracted text content of a content item."""
-        if item_id not in self._item_contents:
+        content = self._ensure_item(item_id)
+        if content is None:
             raise ItemNotFoundError(item_id)
-        return self._item_contents[item_id]
+        return content
     
-    async def search(self, query: str, course_id: str) -> list[SearchResult]:
+    async def search(
+        self,
+        query: str,
+        course_id: str,
+        limit: int | None = None
+    ) -> list[SearchResult]:
         """
         Search within a specific course's materials.
         
         Simple text-based search for stub implementation.
         Real implementation would use Moodle's search API.
         """
+        await self.warmup()
+        self._ensure_course_content()
         if course_id not in self._course_content_cache:
             raise CourseNotFoundError(course_id)
         
-        results: list[SearchResult] = []
-        course_content = self._course_content_cache[course_id]
-        query_lower = query.lower()
+        self._ensure_search_index(course_id)
         
-        def search_in_section(section: Section) -> None:
-            """Recursively search items in a section."""
-            for item in section.items:
-                # Search in item name
-                if query_lower in item.name.lower():
-                    snippet = self._create_snippet(item.name, query)
-                    results.append(SearchResult(
-                        item=item,
-                        section_name=section.name,
-                        snippet=snippet,
-                        relevance_score=0.8,
-                    ))
-                # Search in item content if available
-                elif item.id in self._item_contents:
-                    content = self._item_contents[item.id]
-                    if query_lower in content.lower():
-                        snippet = self._create_snippet(content, query)
-                        results.append(SearchResult(
-                            item=item,
-                            section_name=section.name,
-                            snippet=snippet,
-                            relevance_score=0.6,
-                        ))
-            
-            # Search subsections
-            for subsection in section.subsections:
-                search_in_section(subsection)
+        # Sorted-then-sliced matches heapq.nlargest(), which rank_results() uses for limits
+        ranked = self._ranked_results(course_id, query.lower())
+        return list(ranked if limit is None else ranked[:max(limit, 0)])
+    
+    def _rank_query(self, course_id: str, query_lower: str) -> tuple[SearchResult, ...]:
+        """Match and rank one query (wrapped by the _ranked_results LRU)."""
+        columns = self._search_entries[course_id]
+        positions = list(range(len(columns.items)))
+        return tuple(rank_results(self._collect_results(columns, positions, query_lower), None))
+    
+    async def search_many(
+        self,
+        queries: list[str],
+        course_id: str,
+        limit: int | None = None
+    ) -> list[list[SearchResult]]:
+        """
+        Run several searches within a course in one pass.
         
-        for section in course_content.sections:
-            search_in_section(section)
+        When pyahocorasick is installed, all queries are compiled into a
+        single automaton and the course's lowercased corpus is scanned once,
+        instead of once per query. Otherwise each query runs through search().
         
-        # Sort by relevance score
-        results.sort(key=lambda r: r.relevance_score, reverse=True)
-        return results
+        Returns:
+            One ranked result list per query, in the order given
+        """
+        usable = ahocorasick is not None and len(queries) > 1 and all(
+            query and "\0" not in query for query in queries
+        )
+        if not usable:
+            return [await self.search(query, course_id, limit) for query in queries]
+        
+        await self.warmup()
+        self._ensure_course_content()
+        if course_id not in self._course_content_cache:
+            raise CourseNotFoundError(course_id)
+        
+        self._ensure_search_index(course_id)
+        columns = self._search_entries[course_id]
+        corpus, segment_starts = self._ensure_search_corpus(course_id)
+        
+        queries_lower = [query.lower() for query in queries]
+        automaton = ahocorasick.Automaton()
+        for query_lower in set(queries_lower):
+            automaton.add_word(query_lower, query_lower)
+        automaton.make_automaton()
+        
+        # Each segment is one entry's name (even) or content (odd)
+        hit_positions: dict[str, set[int]] = {q: set() for q in queries_lower}
+        for end_index, query_lower in automaton.iter(corpus):
+            segment = bisect.bisect_right(segment_starts, end_index) - 1
+            hit_positions[query_lower].add(segment // 2)
+        
+        all_results: list[list[SearchResult]] = []
+        for query_lower in queries_lower:
+            candidates = sorted(hit_positions[query_lower])
+            all_results.append(
+                rank_results(self._collect_results(columns, candidates, query_lower), limit)
+            )
+        
+        return all_results
     
-    def _create_snippet(self, text: str, query: str, context_chars: int = 50) -> str:
-        """Create a snippet with the query highlighted in context."""
-        query_lower = query.lower()
-        text_lower = text.lower()
+    def _ensure_search_corpus(self, course_id: str) -> tuple[str, list[int]]:
+        """Build the NUL-joined lowercased corpus for search_many() once."""
+        cached = self._search_corpus.get(course_id)
+        if cached is not None:
+            return cached
         
-        idx = text_lower.find(query_lower)
-        if idx == -1:
-            return text[:100] + "..." if len(text) > 100 else text
+        columns = self._search_entries[course_id]
+        segments: list[str] = []
+        for name_lower, content_lower in zip(columns.names_lower, columns.contents_lower):
+            segments.append(name_lower)
+            segments.append(content_lower or "")
         
-        start = max(0, idx - context_chars)
-        end = min(len(text), idx + len(query) + context_chars)
+        segment_starts: list[int] = []
+        offset = 0
+        for segment in segments:
+            segment_starts.append(offset)
+            offset += len(segment) + 1
         
-        snippet = text[start:end]
-        if start > 0:
-            snippet = "..." + snippet
-        if end < len(text):
-            snippet = snippet + "..."
+        cached = ("\0".join(segments), segment_starts)
+        self._search_corpus[course_id] = cached
+        return cached
+    
+    def _collect_results(
+        self,
+        columns: _SearchColumns,
+        positions: list[int],
+        query_lower: str
+    ) -> list[SearchResult]:
+        """
+        Match entries at positions against the query and build their results.
+        
+        Name hits (0.8) come before content-only hits (0.6), each in position
+        order, which is the order a stable sort by relevance produces.
+        """
+        name_hits, content_hits = search_flat(
+            columns.names_lower, columns.contents_lower, positions, query_lower
+        )
         
-        return snippet
+        results: list[SearchResult] = []
+        for position in name_hits:
+            item = columns.items[position]
+            results.append(SearchResult(
+                item=item,
+                section_name=columns.section_names[position],
+                snippet=create_snippet(item.name, columns.names_lower[position], query_lower),
+                relevance_score=0.8,
+            ))
+        for position in content_hits:
+            item = columns.items[position]
+            results.append(SearchResult(
+                item=item,
+                section_name=columns.section_names[position],
+                snippet=create_snippet(
+                    self._item_contents[item.id], columns.contents_lower[position], query_lower
+                ),
+                relevance_score=0.6,
+            ))
+        return results
@@ -0,0 +1,43 @@
+"""
+Text file reading helpers shared by the adapters.
+
+Large item text files are decoded straight from a read-only memory map,
+so reading them skips the intermediate bytes copy a buffered read()
+allocates before decoding.
+"""
+
+import mmap
+import os
+from pathlib import Path
+
+
+# Files at least this large are decoded from a memory map
+MMAP_THRESHOLD = 64 * 1024
+
+
+def read_text(path: str | Path) -> str:
+    """
+    Read a UTF-8 text file with text-mode newline handling.
+
+    Args:
+        path: File to read
+
+    Returns:
+        Decoded file contents, with CRLF and CR line endings turned into LF
+
+    Raises:
+        OSError: If the file cannot be opened
+        UnicodeDecodeError: If the file is not valid UTF-8
+    """
+    if os.stat(path).st_size < MMAP_THRESHOLD:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, "utf-8")
+
+    # Match universal-newline behaviour of the text-mode path above
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
@@ -0,0 +1,67 @@
+"""
+String helpers shared by the adapters' parsing and search code.
+
+Both local adapters intern repeated metadata strings, rank search results
+by relevance, and cut the same query-in-context snippets; keeping one copy
+here keeps their behaviour identical.
+"""
+
+import heapq
+import operator
+import sys
+from typing import Any
+
+from plugins.moodle_adapter_plugin.models import SearchResult
+
+
+# Sort key for ranking search results
+_BY_RELEVANCE = operator.attrgetter("relevance_score")
+
+
+def intern_value(value: Any) -> Any:
+    """Intern string values so repeats share one object; pass others through."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def rank_results(results: list[SearchResult], limit: int | None) -> list[SearchResult]:
+    """Order results by relevance score (top-k only when a limit is given)."""
+    if limit is not None:
+        return heapq.nlargest(limit, results, key=_BY_RELEVANCE)
+    results.sort(key=_BY_RELEVANCE, reverse=True)
+    return results
+
+
+def create_snippet(
+    text: str,
+    text_lower: str,
+    query_lower: str,
+    context_chars: int = 50
+) -> str:
+    """
+    Create a snippet with the query in context.
+
+    Args:
+        text: Full text to cut the snippet from
+        text_lower: text.lower(), passed in so callers can reuse a cached
+            copy instead of lowercasing the full text for every hit
+        query_lower: Lowercased query
+        context_chars: Characters of context kept on each side of the match
+
+    Returns:
+        The match with surrounding context, or the start of the text when
+        the query does not occur in it
+    """
+    idx = text_lower.find(query_lower)
+    if idx == -1:
+        return text[:100] + "..." if len(text) > 100 else text
+
+    start = max(0, idx - context_chars)
+    end = min(len(text), idx + len(query_lower) + context_chars)
+
+    snippet = text[start:end]
+    if start > 0:
+        snippet = "..." + snippet
+    if end < len(text):
+        snippet = snippet + "..."
+
+    return snippet